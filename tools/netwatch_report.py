@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
-import csv
+import mmap
 import os
+import pickle
 import sys
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
 from pathlib import Path
-from statistics import median
 
 # ---------- config knobs ----------
 LOG_DIR = os.environ.get("NETWATCH_DIR", "/var/log/netwatch")
@@ -13,192 +20,394 @@ MIN_ROWS_FOR_OUTAGE = int(os.environ.get("NETWATCH_MIN_ROWS", "2"))
 MIN_OUTAGE_SEC = int(os.environ.get("NETWATCH_MIN_SEC", "20"))
 # ----------------------------------
 
+# bump when the cached summary layout changes
+CACHE_VERSION = 4
+
 TS_PARSE = datetime.fromisoformat
+NS_PER_SEC = 1_000_000_000
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_US = timedelta(microseconds=1)
 OUTAGE_STATUSES   = {"LINK_DOWN","NO_GATEWAY","GW_DOWN","WAN_DOWN","DNS_DOWN"}
 DEGRADED_STATUSES = {"WAN_DEGRADED"}
+# WAN stats are only meaningful while the path to WAN is up
+WAN_DOWN_STATUSES = {"WAN_DOWN","GW_DOWN","NO_GATEWAY","LINK_DOWN"}
+# bucket codes, compared as small ints instead of strings
+OK, DEGRADED, OUTAGE = 0, 1, 2
+# status -> bucket code; anything not listed counts as OK
+BUCKET_CODE = {**{s: OUTAGE for s in OUTAGE_STATUSES},
+               **{s: DEGRADED for s in DEGRADED_STATUSES}}
 
 def month_tags(ref: datetime):
     cur = ref.strftime("%Y-%m")
     prev = (ref.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
     return cur, prev
 
-def _f(row, key, default=None, cast=float):
-    v = row.get(key, "")
-    if v is None or v == "":
-        return default
-    try:
-        return cast(v)
-    except Exception:
-        return default
+def _to_ns(dt: datetime) -> int:
+    """Epoch nanoseconds for a parsed timestamp (naive = local time)."""
+    if dt.tzinfo is None:
+        return int(dt.timestamp()) * NS_PER_SEC + dt.microsecond * 1000
+    # one timedelta subtraction, no float round-trip through timestamp()
+    return (dt - EPOCH) // ONE_US * 1000
+
+_HOURS = {}   # "YYYY-MM-DDTHH+HH:MM" -> (epoch seconds at the top of that hour, day id)
+
+def day_id(dt: datetime) -> int:
+    """Local calendar day as an int (days since 1970-01-01)."""
+    return dt.toordinal() - EPOCH_ORDINAL
+
+def day_str(day: int) -> str:
+    return date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+def parse_ts(s: str):
+    """Return (epoch ns, local day id) for a log timestamp.
+
+    The logger writes `date --iso-8601=seconds` (YYYY-MM-DDTHH:MM:SS+HH:MM).
+    For that shape only the hour is resolved through TS_PARSE (once, then
+    memoized); minutes and seconds are range-checked and added as plain
+    ints. Anything else, including out-of-range fields, falls back to a
+    full TS_PARSE (which rejects what it can't read).
+    """
+    if len(s) == 25 and s[10] == "T" and s[13] == s[16] == ":":
+        mm, ss = int(s[14:16]), int(s[17:19])
+        if 0 <= mm < 60 and 0 <= ss < 60:
+            key = s[:13] + s[19:]
+            hour = _HOURS.get(key)
+            if hour is None:
+                dt = TS_PARSE(s[:13] + ":00:00" + s[19:])
+                hour = _HOURS[key] = (int(dt.timestamp()), day_id(dt))
+            return (hour[0] + mm*60 + ss) * NS_PER_SEC, hour[1]
+    dt = TS_PARSE(s)
+    return _to_ns(dt), day_id(dt)
+
+def fmt_ts(s: str) -> str:
+    """Render a raw log timestamp for display (parsed only when printed)."""
+    return str(TS_PARSE(s))
+
+class Row:
+    """One parsed log line: timestamp, status and the WAN fields.
+
+    `ts` is the raw timestamp string; `ts_ns`/`day` are what the scan uses.
+    WAN fields are left as raw bytes cells (b"" when blank or absent) and
+    only converted by whoever reads them.
+    """
+    __slots__ = ("ts", "ts_ns", "day", "status", "wan_loss", "wan_rtt")
+
+    def __init__(self, ts, ts_ns, day, status, wan_loss, wan_rtt):
+        self.ts = ts
+        self.ts_ns = ts_ns
+        self.day = day
+        self.status = status
+        self.wan_loss = wan_loss
+        self.wan_rtt = wan_rtt
+
+# columns read_rows pulls out of each line, in Row order
+ROW_COLUMNS = ("timestamp", "status", "wan_loss_pct", "wan_rtt_avg_ms")
 
 def read_rows(path: Path):
-    """Yield rows with parsed timestamp and convenient numeric fields."""
-    with path.open(newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    """Yield Row objects with parsed timestamp and raw WAN fields.
+
+    netwatch.sh writes plain ASCII with no quoting, so lines are split on
+    commas straight out of an mmap instead of going through the csv module.
+    """
+    with path.open("rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:   # empty file
+            return
+    with mm:
+        header = mm.readline().rstrip(b"\r\n").decode("ascii", "replace").split(",")
+        if "timestamp" not in header:
+            return
+        # resolve column positions once; columns old logs lack point at a
+        # blank cell at index len(header), past every real cell
+        pad = len(header)
+        idx = {name: i for i, name in enumerate(header)}
+        cols = [idx.get(name, pad) for name in ROW_COLUMNS]
+        padded = pad in cols
+        pick = itemgetter(*cols)
+        # don't split past the last column we need
+        maxsplit = -1 if padded else max(cols) + 1
+        # dictionary-encode the status column: a log only ever holds a
+        # handful of distinct cells, so each is decoded/stripped once and
+        # every row shares the same str object
+        statuses = {}
+        for line in iter(mm.readline, b""):
+            rec = line.rstrip(b"\r\n").split(b",", maxsplit)
+            if padded:
+                # short rows get blank cells, extras past the header are
+                # dropped, so index pad is always the appended blank
+                if len(rec) != pad:
+                    del rec[pad:]
+                    rec += [b""] * (pad - len(rec))
+                rec.append(b"")
             try:
-                row["_ts"] = TS_PARSE(row["timestamp"])
-            except Exception:
-                continue
-            # normalize fields the new logger writes; tolerate old logs
-            row["_status"] = row.get("status", "").strip()
-            row["_wan_loss"] = _f(row, "wan_loss_pct", default=None)
-            row["_wan_rtt"]  = _f(row, "wan_rtt_avg_ms", default=None)
-            # optional alternate-target columns (if you added them)
-            row["_wan_alt_loss"] = _f(row, "wan_alt_loss_pct", default=None)
-            row["_wan_alt_rtt"]  = _f(row, "wan_alt_rtt_avg_ms", default=None)
-            yield row
-
-def as_bucket(status: str) -> str:
-    if status in OUTAGE_STATUSES:   return "OUTAGE"
-    if status in DEGRADED_STATUSES: return "DEGRADED"
-    return "OK"
-
-def group_segments(rows):
-    """Group consecutive rows by bucket (OK/DEGRADED/OUTAGE)."""
-    segs, cur = [], None
+                ts, raw_status, wan_loss, wan_rtt = pick(rec)
+                ts = ts.decode("ascii")
+                ts_ns, day = parse_ts(ts)
+                status = statuses.get(raw_status)
+                if status is None:
+                    status = statuses[raw_status] = raw_status.strip().decode("ascii")
+            except (IndexError, ValueError):
+                continue    # malformed or truncated line
+            yield Row(ts, ts_ns, day, status, wan_loss, wan_rtt)
+
+def new_segments():
+    """Struct-of-arrays store for non-OK runs of rows (OK runs aren't kept)."""
+    return {
+        "bucket": array("b"),     # DEGRADED / OUTAGE
+        "dur_ns": array("q"),
+        "rows": array("i"),       # 4 bytes: ~2**31 rows is centuries of 15s samples
+        "day": array("i"),        # day id of the first row
+        "start": [], "end": [],   # raw timestamps, parsed only when printed
+        "first_status": [],
+    }
+
+def _add_segment(segs, bucket, start, end, dur_ns, rows, day, status):
+    segs["bucket"].append(bucket)
+    segs["dur_ns"].append(dur_ns)
+    segs["rows"].append(rows)
+    segs["day"].append(day)
+    segs["start"].append(start)
+    segs["end"].append(end)
+    segs["first_status"].append(status)
+
+def scan_rows(rows):
+    """Single pass over rows: segments, availability time, WAN samples, days seen.
+
+    Everything downstream works off this result, so rows are never materialized.
+    """
+    segs = new_segments()
+    n = 0
+    prev_ts = prev_ns = prev_bucket = None
+    # open segment; it ends at the previous row when the bucket changes
+    seg_n = seg_ts = seg_ns = seg_day = seg_status = None
+    total_ns = ok_ns = 0    # observed / OK time from timestamp deltas
+    rtt_counts, rtt_n = Counter(), 0
+    loss_sum, loss_n = 0.0, 0
+    days, last_day = set(), None
     for r in rows:
-        bucket = as_bucket(r["_status"])
-        if cur is None or bucket != cur["bucket"]:
-            if cur: segs.append(cur)
-            cur = {
-                "bucket": bucket,
-                "start": r["_ts"],
-                "end":   r["_ts"],
-                "rows":  1,
-                "first_status": r["_status"],
-            }
-        else:
-            cur["end"] = r["_ts"]
-            cur["rows"] += 1
-    if cur: segs.append(cur)
-    return segs
+        ts, ts_ns, day, status = r.ts, r.ts_ns, r.day, r.status
+        bucket = BUCKET_CODE.get(status, OK)
+        if bucket != prev_bucket:
+            if prev_bucket:     # close a DEGRADED/OUTAGE run
+                _add_segment(segs, prev_bucket, seg_ts, prev_ts, prev_ns - seg_ns,
+                             n - seg_n, seg_day, seg_status)
+            seg_n, seg_ts, seg_ns, seg_day, seg_status = n, ts, ts_ns, day, status
+        # availability: credit the gap to the previous row's bucket
+        if prev_ns is not None:
+            dt = ts_ns - prev_ns
+            if dt >= 0:     # guard logs with clock jumps
+                total_ns += dt
+                if prev_bucket == OK:
+                    ok_ns += dt
+        n += 1
+        prev_ts, prev_ns, prev_bucket = ts, ts_ns, bucket
+        # WAN samples only while WAN is reachable
+        if status not in WAN_DOWN_STATUSES:
+            v = r.wan_rtt
+            if v:
+                try:
+                    rtt_counts[float(v)] += 1
+                    rtt_n += 1
+                except ValueError:
+                    pass
+            v = r.wan_loss
+            if v:
+                try:
+                    loss_sum += float(v)
+                    loss_n += 1
+                except ValueError:
+                    pass
+        if day != last_day:
+            days.add(day)
+            last_day = day
+    if prev_bucket:
+        _add_segment(segs, prev_bucket, seg_ts, prev_ts, prev_ns - seg_ns,
+                     n - seg_n, seg_day, seg_status)
+    return {"rows": n, "segs": segs, "total_ns": total_ns, "ok_ns": ok_ns,
+            "rtt_counts": rtt_counts, "rtt_n": rtt_n,
+            "loss_sum": loss_sum, "loss_n": loss_n, "days": days}
+
+def rtt_percentiles(counts, n):
+    """(p50, p95) in ms from a value -> count tally of RTT samples.
+
+    Same rules as the old sorted-list version: the median averages the two
+    middle samples, p95 is the nearest-rank sample. ping prints 3 decimals,
+    so there are only a few thousand distinct values to walk.
+    """
+    values = sorted(counts)
+    cum = list(accumulate(counts[v] for v in values))
+    def kth(k):     # k-th smallest sample (0-based)
+        return values[bisect_right(cum, k)]
+    mid = n // 2
+    p50 = kth(mid) if n % 2 else (kth(mid - 1) + kth(mid)) / 2
+    p95 = kth(max(0, int(round(0.95*(n-1)))))
+    return p50, p95
 
 def classify_segments(segs):
-    """Split into outages, blips (filtered), degraded segments."""
+    """Split segment indices into outages, blips (filtered), degraded."""
+    min_rows, min_ns = MIN_ROWS_FOR_OUTAGE, MIN_OUTAGE_SEC * NS_PER_SEC
     outages, blips, degraded = [], [], []
-    for s in segs:
-        dur = s["end"] - s["start"]
-        s = {**s, "dur": dur}
-        if s["bucket"] == "DEGRADED":
-            degraded.append(s); continue
-        if s["bucket"] == "OK":
-            continue
-        # OUTAGE bucket
-        if s["rows"] >= MIN_ROWS_FOR_OUTAGE or dur.total_seconds() >= MIN_OUTAGE_SEC:
-            outages.append(s)
+    for i, (bucket, rows, dur_ns) in enumerate(zip(segs["bucket"], segs["rows"], segs["dur_ns"])):
+        if bucket == DEGRADED:
+            degraded.append(i)
+        elif rows >= min_rows or dur_ns >= min_ns:
+            outages.append(i)
         else:
-            blips.append(s)
+            blips.append(i)
     return outages, blips, degraded
 
-def human(td: timedelta):
-    secs = int(td.total_seconds())
-    h, secs = divmod(secs, 3600)
-    m, s = divmod(secs, 60)
-    if h: return f"{h}h {m}m {s}s"
-    if m: return f"{m}m {s}s"
-    return f"{s}s"
-
-def availability_from_rows(rows):
-    """Compute % of time in OK vs non-OK using timestamp deltas."""
-    if len(rows) < 2:
-        return 100.0, timedelta(0), timedelta(0)
-    ok = timedelta(0)
-    total = timedelta(0)
-    for prev, cur in zip(rows, rows[1:]):
-        dt = cur["_ts"] - prev["_ts"]
-        if dt.total_seconds() < 0:   # guard logs with clock jumps
-            continue
-        total += dt
-        if as_bucket(prev["_status"]) == "OK":
-            ok += dt
-    if total.total_seconds() == 0:
-        return 100.0, total, ok
-    return (ok/total)*100.0, total, ok
-
-def wan_quality(rows):
-    """Summaries over WAN stats when WAN is 'ok' in that row."""
-    rtts = [r["_wan_rtt"] for r in rows if r["_wan_rtt"] is not None and r["_status"] not in {"WAN_DOWN","GW_DOWN","NO_GATEWAY","LINK_DOWN"}]
-    losses = [r["_wan_loss"] for r in rows if r["_wan_loss"] is not None and r["_status"] not in {"WAN_DOWN","GW_DOWN","NO_GATEWAY","LINK_DOWN"}]
-    if not rtts and not losses:
+def human_ns(ns: int) -> str:
+    return _human_secs(ns // NS_PER_SEC)
+
+@lru_cache(maxsize=4096)
+def _human_secs(secs: int) -> str:
+    # durations repeat a lot at 1s resolution (15s samples), so memoize
+    h, rem = divmod(secs, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h {m}m {s}s" if h else f"{m}m {s}s" if m else f"{s}s"
+
+def availability(total_ns: int, ok_ns: int):
+    """Return % of observed time spent in OK."""
+    if not total_ns:
+        return 100.0
+    return (ok_ns/total_ns)*100.0
+
+def wan_quality(rtt_counts, rtt_n, loss_sum, loss_n):
+    """Summaries over WAN samples taken while WAN was up."""
+    if not rtt_n and not loss_n:
         return None
-    p50 = median(rtts) if rtts else None
-    p95 = None
-    if rtts:
-        sorted_r = sorted(rtts)
-        idx = max(0, int(round(0.95*(len(sorted_r)-1))))
-        p95 = sorted_r[idx]
-    mean_loss = sum(losses)/len(losses) if losses else None
-    return {"rtt_p50_ms": p50, "rtt_p95_ms": p95, "loss_mean_pct": mean_loss, "samples": len(rtts)}
-
-def per_day_summary(rows, outages, degraded):
-    """Return a dict: day -> {'outage_dur':timedelta, 'degraded_dur':timedelta, 'outages':int, 'degraded':int}"""
-    from collections import defaultdict
-    daily = defaultdict(lambda: {"outage_dur": timedelta(0), "degraded_dur": timedelta(0), "outages": 0, "degraded": 0})
-    for seg in outages:
-        day = seg["start"].date().isoformat()
-        daily[day]["outages"] += 1
-        daily[day]["outage_dur"] += seg["dur"]
-    for seg in degraded:
-        day = seg["start"].date().isoformat()
-        daily[day]["degraded"] += 1
-        daily[day]["degraded_dur"] += seg["dur"]
-    # include days seen in raw rows (even if no events)
-    for r in rows:
-        day = r["_ts"].date().isoformat()
-        daily.setdefault(day, daily[day])
-    return dict(sorted(daily.items()))
+    p50, p95 = rtt_percentiles(rtt_counts, rtt_n) if rtt_n else (None, None)
+    mean_loss = loss_sum/loss_n if loss_n else None
+    return {"rtt_p50_ms": p50, "rtt_p95_ms": p95,
+            "loss_mean_pct": mean_loss, "samples": rtt_n}
+
+def per_day_summary(days, segs, outages, degraded):
+    """Return a dict: day id -> {'outage_ns':int, 'degraded_ns':int, 'outages':int, 'degraded':int}
+
+    Covers every day seen in the rows (even if no events), oldest first.
+    """
+    if not days:
+        return {}
+    # one slot per day in the observed range, indexed by day id - first
+    first = min(days)
+    n_days = max(days) - first + 1
+    outage_ns, outage_n = [0] * n_days, [0] * n_days
+    degraded_ns, degraded_n = [0] * n_days, [0] * n_days
+    seg_day, seg_dur = segs["day"], segs["dur_ns"]
+    for i in outages:
+        d = seg_day[i] - first
+        outage_n[d] += 1
+        outage_ns[d] += seg_dur[i]
+    for i in degraded:
+        d = seg_day[i] - first
+        degraded_n[d] += 1
+        degraded_ns[d] += seg_dur[i]
+    daily = {}
+    for day in sorted(days):
+        d = day - first
+        daily[day] = {"outage_ns": outage_ns[d], "degraded_ns": degraded_ns[d],
+                      "outages": outage_n[d], "degraded": degraded_n[d]}
+    return daily
 
-def report_month(tag: str, per_day=False, log_dir=LOG_DIR):
+def summarize_month(path: Path):
+    """Parse one monthly CSV into everything report_month prints (None if no rows)."""
+    scan = scan_rows(read_rows(path))
+    if not scan["rows"]:
+        return None
+    segs = scan["segs"]
+    outages, blips, degraded = classify_segments(segs)
+    return {
+        "segs": segs,
+        "outages": outages,
+        "blips": len(blips),
+        "degraded": degraded,
+        "observed_ns": scan["total_ns"],
+        "avail_pct": availability(scan["total_ns"], scan["ok_ns"]),
+        "wan": wan_quality(scan["rtt_counts"], scan["rtt_n"], scan["loss_sum"], scan["loss_n"]),
+        "daily": per_day_summary(scan["days"], segs, outages, degraded),
+    }
+
+def load_summary(path: Path):
+    """summarize_month, cached in a pickle next to the CSV.
+
+    Only meant for finished months; the live CSV changes every few
+    seconds, so caching it would just rewrite the pickle on each run. The
+    cache is keyed on the CSV's mtime/size and the outage knobs.
+    Unreadable or unwritable caches are ignored.
+    """
+    cache = path.with_suffix(".summary.pkl")
+    st = path.stat()
+    key = (CACHE_VERSION, st.st_mtime_ns, st.st_size, MIN_ROWS_FOR_OUTAGE, MIN_OUTAGE_SEC)
+    try:
+        with cache.open("rb") as f:
+            cached_key, summary = pickle.load(f)
+        if cached_key == key:
+            return summary
+    except Exception:
+        pass
+    summary = summarize_month(path)
+    try:
+        with cache.open("wb") as f:
+            pickle.dump((key, summary), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return summary
+
+def report_month(tag: str, per_day=False, log_dir=LOG_DIR) -> str:
+    """Return the printable report for one month."""
     path = Path(log_dir) / f"netwatch_{tag}.csv"
     if not path.exists():
-        print(f"[{tag}] no log file: {path}")
-        return
-    rows = list(read_rows(path))
-    if not rows:
-        print(f"\n=== {tag} — {path} ===\nNo data.")
-        return
-
-    segs = group_segments(rows)
-    outages, blips, degraded = classify_segments(segs)
-    avail_pct, observed, ok_time = availability_from_rows(rows)
-    wan = wan_quality(rows)
+        return f"[{tag}] no log file: {path}\n"
+    # past months are immutable once rolled over; only those are cached
+    finished = tag < datetime.now().strftime("%Y-%m")
+    summary = load_summary(path) if finished else summarize_month(path)
+    if summary is None:
+        return f"\n=== {tag} — {path} ===\nNo data.\n"
 
-    print(f"\n=== {tag} — {path} ===")
+    segs = summary["segs"]
+    outages, blips, degraded = summary["outages"], summary["blips"], summary["degraded"]
+    seg_dur = segs["dur_ns"]
+    avail_pct, wan = summary["avail_pct"], summary["wan"]
+
+    buf = []    # output lines, joined once at the end
+    buf.append(f"\n=== {tag} — {path} ===")
     # Outages
     if outages:
-        for i, o in enumerate(outages, 1):
-            print(f"{i:02d}. {o['first_status']:<11} from {o['start']} to {o['end']}  (dur {human(o['dur'])})")
+        for n, i in enumerate(outages, 1):
+            buf.append(f"{n:02d}. {segs['first_status'][i]:<11} from {fmt_ts(segs['start'][i])} to {fmt_ts(segs['end'][i])}  (dur {human_ns(seg_dur[i])})")
     else:
-        print("No qualifying outages (>= "
-              f"{MIN_ROWS_FOR_OUTAGE} rows or {MIN_OUTAGE_SEC}s).")
+        buf.append("No qualifying outages (>= "
+                   f"{MIN_ROWS_FOR_OUTAGE} rows or {MIN_OUTAGE_SEC}s).")
 
-    tot_down = sum((o["dur"] for o in outages), timedelta(0))
-    longest = max((o["dur"] for o in outages), default=timedelta(0))
+    tot_down = sum(seg_dur[i] for i in outages)
+    longest = max((seg_dur[i] for i in outages), default=0)
 
-    print(f"— Total outages: {len(outages)}")
-    print(f"— Cumulative downtime: {human(tot_down)}")
-    print(f"— Longest single outage: {human(longest)}")
+    buf.append(f"— Total outages: {len(outages)}")
+    buf.append(f"— Cumulative downtime: {human_ns(tot_down)}")
+    buf.append(f"— Longest single outage: {human_ns(longest)}")
     if blips:
-        print(f"— Blips filtered (<{MIN_OUTAGE_SEC}s or single row): {len(blips)}")
+        buf.append(f"— Blips filtered (<{MIN_OUTAGE_SEC}s or single row): {blips}")
     if degraded:
-        tot_deg = sum((d["dur"] for d in degraded), timedelta(0))
-        print(f"— Degraded periods: {len(degraded)} (total {human(tot_deg)})")
+        tot_deg = sum(seg_dur[i] for i in degraded)
+        buf.append(f"— Degraded periods: {len(degraded)} (total {human_ns(tot_deg)})")
 
-    print(f"— Observed window: {human(observed)}  |  Availability: {avail_pct:.3f}%")
+    buf.append(f"— Observed window: {human_ns(summary['observed_ns'])}  |  Availability: {avail_pct:.3f}%")
 
     if wan:
         r50 = f"{wan['rtt_p50_ms']:.2f} ms" if wan['rtt_p50_ms'] is not None else "n/a"
         r95 = f"{wan['rtt_p95_ms']:.2f} ms" if wan['rtt_p95_ms'] is not None else "n/a"
         lm  = f"{wan['loss_mean_pct']:.2f} %" if wan['loss_mean_pct'] is not None else "n/a"
-        print(f"— WAN RTT p50: {r50} | p95: {r95} | mean loss: {lm} (samples: {wan['samples']})")
+        buf.append(f"— WAN RTT p50: {r50} | p95: {r95} | mean loss: {lm} (samples: {wan['samples']})")
 
     if per_day:
-        print("\nPer-day summary:")
-        daily = per_day_summary(rows, outages, degraded)
-        for day, d in daily.items():
-            od, dd = human(d["outage_dur"]), human(d["degraded_dur"])
-            print(f"{day}: outages={d['outages']} ({od}), degraded={d['degraded']} ({dd})")
+        buf.append("\nPer-day summary:")
+        for day, d in summary["daily"].items():
+            od, dd = human_ns(d["outage_ns"]), human_ns(d["degraded_ns"])
+            buf.append(f"{day_str(day)}: outages={d['outages']} ({od}), degraded={d['degraded']} ({dd})")
+
+    return "\n".join(buf) + "\n"
 
 def main():
     import argparse
@@ -211,11 +420,14 @@ def main():
     log_dir = args.dir
 
     if args.month:
-        report_month(args.month, per_day=args.per_day, log_dir=log_dir)
+        sys.stdout.write(report_month(args.month, per_day=args.per_day, log_dir=log_dir))
     else:
-        now = datetime.now()
-        for tag in month_tags(now):
-            report_month(tag, per_day=args.per_day, log_dir=log_dir)
+        # the two months are independent files: build both reports in
+        # parallel, print them in order
+        tags = month_tags(datetime.now())
+        with ProcessPoolExecutor(max_workers=len(tags)) as ex:
+            futures = [ex.submit(report_month, tag, per_day=args.per_day, log_dir=log_dir) for tag in tags]
+            sys.stdout.write("".join(fut.result() for fut in futures))
 
 if __name__ == "__main__":
     main()